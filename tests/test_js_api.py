@@ -24,6 +24,24 @@ def test_concurrent():
     run_test(webview, window, concurrent)
 
 
+def test_exposed_attributes():
+    api = DerivedApi()
+    window = webview.create_window('JSBridge test', html='<html><body>TEST</body></html>', js_api=api)
+    run_test(webview, window, exposed_attributes)
+
+
+def test_api_changes():
+    api = ChangingApi()
+    window = webview.create_window('JSBridge test', html='<html><body>TEST</body></html>', js_api=api)
+    run_test(webview, window, api_changes, (api,))
+
+
+def test_class_changes():
+    api = LateApi()
+    window = webview.create_window('JSBridge test', html='<html><body>TEST</body></html>', js_api=api)
+    run_test(webview, window, class_changes)
+
+
 class NestedApi:
     @classmethod
     def get_int(cls):
@@ -70,6 +88,56 @@ class Api:
         return param1, param2, param3
 
 
+class DynamicApi:
+    def __getattr__(self, name):
+        raise AttributeError(name)
+
+    def get_dynamic(self):
+        return 'dynamic'
+
+
+class BaseApi:
+    def get_inherited(self):
+        return 'inherited'
+
+    def shadowed(self):
+        return 'method'
+
+    @staticmethod
+    def get_static():
+        return 'static'
+
+
+class DerivedApi(BaseApi):
+    def __init__(self):
+        self.shadowed = NestedApi()
+        self.dynamic = DynamicApi()
+
+    def get_own(self):
+        return 'own'
+
+
+class ChangingApi:
+    def __init__(self):
+        self.sub = None
+
+    def login(self):
+        self.sub = NestedApi()
+
+
+class LateApi:
+    def get_int(self):
+        return 420
+
+
+def get_late(self):
+    return 'late'
+
+
+def get_exposed():
+    return 'exposed'
+
+
 def js_bridge(window):
     assert_js(window, 'get_int', 420)
     assert_js(window, 'get_float', 3.141)
@@ -84,6 +152,35 @@ def js_bridge(window):
     assert_js(window, 'nested_instance.get_int_instance', 423)
 
 
+def exposed_attributes(window):
+    assert_js(window, 'get_own', 'own')
+    assert_js(window, 'get_inherited', 'inherited')
+    assert_js(window, 'shadowed.get_int_instance', 423)
+    assert_js(window, 'dynamic.get_dynamic', 'dynamic')
+    assert window.evaluate_js('typeof window.pywebview.api.shadowed') == 'object'
+    assert window.evaluate_js('typeof window.pywebview.api.get_static') == 'undefined'
+
+
+def api_changes(window, api):
+    assert window.evaluate_js('typeof window.pywebview.api.sub') == 'undefined'
+
+    api.login()
+    window.expose(get_exposed)
+    window.load_html('<html><body>TEST</body></html>')
+
+    assert_js(window, 'sub.get_int_instance', 423)
+    assert_js(window, 'get_exposed', 'exposed')
+
+
+def class_changes(window):
+    assert window.evaluate_js('typeof window.pywebview.api.get_late') == 'undefined'
+
+    LateApi.get_late = get_late
+    window.load_html('<html><body>TEST</body></html>')
+
+    assert_js(window, 'get_late', 'late')
+
+
 def exception(window):
     assert_js(window, 'raise_exception', 'error')
 
@@ -30,7 +30,7 @@ from webview.localization import original_localization
 from webview.menu import Menu
 from webview.screen import Screen
 from webview.util import (_TOKEN, abspath, base_uri, escape_line_breaks, escape_string,
-                          is_app, is_local_url, parse_file_type)
+                          is_app, is_local_url, parse_file_type, shutdown_bridge_pool)
 from webview.window import Window
 
 __all__ = (
@@ -215,6 +215,7 @@ def start(
     if menu:
         guilib.set_app_menu(menu)
     guilib.create_window(windows[0])
+    shutdown_bridge_pool()
     # keyfile is deleted by the ServerAdapter right after wrap_socket()
     if certfile:
         os.unlink(certfile)
@@ -10,10 +10,10 @@ class DOMEvent:
     def __init__(self, event, window: Window, element: Element) -> None:
         self.event = event
         self.__element = element
-        self._items: list = []
+        self._items: set = set()
 
     def __add__(self, item):
-        self._items.append(item)
+        self._items.add(item)
         self.__element.on(self.event, item)
         return self
     def __sub__(self, item):
@@ -22,7 +22,7 @@ class DOMEvent:
         return self
 
     def __iadd__(self, item):
-        self._items.append(item)
+        self._items.add(item)
         self.__element.on(self.event, item)
         return self
 
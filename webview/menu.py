@@ -1,10 +1,11 @@
 # from __future__ import annotations
 
 # from collections.abc import Callable
+from collections.abc import Sequence
 
 
 class Menu:
-    def __init__(self, title: str, items: list = []) -> None:
+    def __init__(self, title: str, items: Sequence = ()) -> None:
         """
         Args:
             title: the menu or submenu title
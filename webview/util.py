@@ -13,10 +13,12 @@ import os
 import re
 import sys
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from glob import glob
 from http.cookies import SimpleCookie
 from platform import architecture
-from threading import Thread
+from types import FunctionType
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
@@ -26,11 +28,22 @@ from webview.dom import _dnd_state
 from webview.errors import WebViewException
 import urllib.parse
 
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from webview.window import Window
 
 _TOKEN = uuid4().hex
 
+_MODULE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+_SUPPORTS_SAMESITE = sys.version_info >= (3, 8)  # SimpleCookie supports samesite since 3.8
+
 DEFAULT_HTML = """
     <!doctype html>
     <html>
@@ -43,6 +56,73 @@ DEFAULT_HTML = """
 
 logger = logging.getLogger('pywebview')
 
+_FILE_FILTER_RE = re.compile(r'^([\w ]+)\((\*(?:\.(?:\w+|\*))*(?:;\*\.\w+)*)\)$')
+_BASE_TAG_RE = re.compile(r'<(?P<tag>base|head|html|body)(?:[\s]+[^>]*|)>')
+
+# Fixed rather than based on cpu_count, so that a few long-running calls do not block the rest
+_BRIDGE_POOL_SIZE = 32
+
+
+def _create_bridge_pools() -> dict:
+    return {
+        'api': ThreadPoolExecutor(
+            max_workers=_BRIDGE_POOL_SIZE, thread_name_prefix='pywebview-api'
+        ),
+        'event': ThreadPoolExecutor(
+            max_workers=_BRIDGE_POOL_SIZE, thread_name_prefix='pywebview-event'
+        ),
+    }
+
+
+# Worker threads for JS API calls and DOM event handlers. DOM event handlers run in their own pool,
+# so that long-running API calls cannot starve UI events. Threads are spawned lazily and reused.
+_bridge_pools = _create_bridge_pools()
+
+
+def _log_bridge_exception(future: Future) -> None:
+    exception = future.exception()
+    if exception is not None:
+        logger.error('Error occurred in a JS bridge call', exc_info=exception)
+
+
+def submit_bridge_call(pool: str, func, *args: Any) -> Future:
+    """
+    Run func in the given JS bridge thread pool, either 'api' or 'event'. Exceptions raised by
+    func are logged.
+    """
+    future = _bridge_pools[pool].submit(func, *args)
+    future.add_done_callback(_log_bridge_exception)
+    return future
+
+
+def shutdown_bridge_pool() -> None:
+    """
+    Shut down the JS bridge thread pools without waiting for pending calls. New pools are put in
+    place, so that bridge calls keep working if the GUI loop is started again.
+    """
+    global _bridge_pools
+    pools, _bridge_pools = _bridge_pools, _create_bridge_pools()
+
+    for pool in pools.values():
+        pool.shutdown(wait=False)
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize obj to a JSON string. Uses orjson if it is available, falling back to the standard
+    json module for the objects orjson cannot serialize (eg. non-string dict keys). Dataclasses and
+    datetime objects are passed through to the json module, so that they raise TypeError as they
+    do without orjson. UUID and Enum members are still serialized natively by orjson, as orjson
+    has no option to disable it.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+        except TypeError:
+            pass
+
+    return json.dumps(obj)
+
 
 def is_app(url: str) -> bool:
     """Returns true if 'url' is a WSGI or ASGI app."""
@@ -50,17 +130,18 @@ def is_app(url: str) -> bool:
 
 
 def is_local_url(url: str) -> bool:
-    return not ((is_app(url)) or (
-            (not url) or (url.startswith('http://')) or (url.startswith('https://')) or url.startswith('file://')))
+    return not (is_app(url) or (not url) or url.startswith(('http://', 'https://', 'file://')))
 
 
 def needs_server(urls) -> bool:
-    return bool([url for url in urls if (is_app(url) or is_local_url(url))])
+    return any(is_app(url) or is_local_url(url) for url in urls)
 
 
+@lru_cache(maxsize=1)
 def get_app_root() -> str:
     """
-    Gets the file root of the application.
+    Gets the file root of the application. The result is cached as it does not change during the
+    lifetime of the process.
     """
 
     if hasattr(sys, '_MEIPASS'):  # Pyinstaller
@@ -108,7 +189,7 @@ def create_cookie(input_: dict) -> SimpleCookie:
         cookie[name]['secure'] = input_['secure']
         cookie[name]['httponly'] = input_['httponly']
 
-        if sys.version_info.major >= 3 and sys.version_info.minor >= 8:
+        if _SUPPORTS_SAMESITE:
             cookie[name]['samesite'] = input_.get('samesite')
 
         return cookie
@@ -124,24 +205,99 @@ def parse_file_type(file_type: str) -> tuple:
     :param file_type: file type string 'description (*.file_extension1;*.file_extension2)' as required by file filter in create_file_dialog
     :return: (description, file extensions) tuple
     """
-    valid_file_filter = r'^([\w ]+)\((\*(?:\.(?:\w+|\*))*(?:;\*\.\w+)*)\)$'
-    match = re.search(valid_file_filter, file_type)
+    match = _FILE_FILTER_RE.search(file_type)
 
     if match:
         return match.group(1).rstrip(), match.group(2)
     raise ValueError(f'{file_type} is not a valid file filter')
 
 
+@lru_cache(maxsize=512)
+def _get_argspec(func: object) -> tuple:
+    # Read positional argument names of plain functions straight from their code object, which is
+    # what inspect.getfullargspec resolves to as well, minus building a full signature
+    if isinstance(func, FunctionType) and not hasattr(func, '__signature__'):
+        code = func.__code__
+        return code.co_varnames[:code.co_argcount]
+
+    return tuple(inspect.getfullargspec(func).args)
+
+
+def get_args(func: object) -> list:
+    """
+    Returns the names of positional arguments of a function or a method.
+    """
+    if inspect.ismethod(func):
+        func = func.__func__
+
+    try:
+        return list(_get_argspec(func))
+    except TypeError:  # unhashable callable
+        return list(inspect.getfullargspec(func).args)
+
+
+def _get_class_attributes(cls: type) -> tuple:
+    """
+    Walks the class MRO with vars() and returns a (methods, others) tuple of its public attributes,
+    inherited ones included. methods holds (name, function) pairs of functions and classmethods,
+    which are bound methods when accessed on an instance. others holds the names of the rest of
+    the attributes, which must be inspected on the instance itself.
+    """
+    attributes = {}
+    for klass in reversed(cls.__mro__):
+        attributes.update(vars(klass))
+
+    methods = []
+    others = []
+
+    for name, value in sorted(attributes.items(), key=lambda item: item[0]):
+        if name.startswith('_'):
+            continue
+        if isinstance(value, FunctionType):
+            methods.append((name, value))
+        elif isinstance(value, classmethod):
+            methods.append((name, value.__func__))
+        else:
+            others.append(name)
+
+    return tuple(methods), tuple(others)
+
+
+def _get_exposed_attributes(obj: object):
+    """
+    Returns a (methods, others) tuple as in _get_class_attributes for an instance of a plain
+    class, taking instance attributes into account. Returns None for classes and objects with
+    custom attribute lookup, which must be inspected with dir().
+    """
+    cls = type(obj)
+
+    if (
+        inspect.isclass(obj)
+        or cls.__dir__ is not object.__dir__
+        or cls.__getattribute__ is not object.__getattribute__
+        or hasattr(cls, '__getattr__')
+    ):
+        return None
+
+    methods, others = _get_class_attributes(cls)
+
+    instance_attributes = [
+        name for name in getattr(obj, '__dict__', {}) if not name.startswith('_')
+    ]
+
+    if instance_attributes:
+        methods = tuple((name, func) for name, func in methods if name not in instance_attributes)
+        others = others + tuple(instance_attributes)
+
+    return methods, others
+
+
 def inject_pywebview(window, platform: str) -> str:
     """"
     Generates and injects a global window.pywebview object
     """
     exposed_objects = []
 
-    def get_args(func: object):
-        params = list(inspect.getfullargspec(func).args)
-        return params
-
     def get_functions(obj: object, base_name: str = '', functions: dict = None):
         if obj in exposed_objects:
             return functions
@@ -151,7 +307,18 @@ def inject_pywebview(window, platform: str) -> str:
         if functions is None:
             functions = {}
 
-        for name in dir(obj):
+        exposed_attributes = _get_exposed_attributes(obj)
+
+        if exposed_attributes is None:
+            methods, names = (), dir(obj)
+        else:
+            methods, names = exposed_attributes
+
+        for name, func in methods:
+            full_name = f"{base_name}.{name}" if base_name else name
+            functions[full_name] = get_args(func)[1:]
+
+        for name in names:
             full_name = f"{base_name}.{name}" if base_name else name
 
             if name.startswith('_'):
@@ -183,21 +350,25 @@ def inject_pywebview(window, platform: str) -> str:
         logger.exception(e)
         func_list = []
 
-    js_code = load_js_files(window, func_list, platform)
+    js_code = load_js_files(window, json_dumps(func_list), platform)
     return js_code
 
 
 def js_bridge_call(window, func_name: str, param: Any, value_id: str) -> None:
     def _call():
+        # The serialized value is wrapped in a JSON string literal, which is a valid JS string
+        # literal as well. json.dumps escapes non-ASCII characters, so U+2028 and U+2029 are safe
+        # for older JS engines too.
         try:
             result = func(*func_params)
-            result = json.dumps(result).replace('\\', '\\\\').replace("'", "\\'")
-            code = f'window.pywebview._returnValues["{func_name}"]["{value_id}"] = {{value: \'{result}\'}}'
+            result = json.dumps(json_dumps(result))
+            code = f'window.pywebview._returnValues["{func_name}"]["{value_id}"] = {{value: {result}}}'
         except Exception as e:
-            logger.error(traceback.format_exc())
-            error = {'message': str(e), 'name': type(e).__name__, 'stack': traceback.format_exc()}
-            result = json.dumps(error).replace('\\', '\\\\').replace("'", "\\'")
-            code = f'window.pywebview._returnValues["{func_name}"]["{value_id}"] = {{isError: true, value: \'{result}\'}}'
+            stack = traceback.format_exc()
+            logger.error(stack)
+            error = {'message': str(e), 'name': type(e).__name__, 'stack': stack}
+            result = json.dumps(json_dumps(error))
+            code = f'window.pywebview._returnValues["{func_name}"]["{value_id}"] = {{isError: true, value: {result}}}'
 
         window.evaluate_js(code)
 
@@ -223,17 +394,28 @@ def js_bridge_call(window, func_name: str, param: Any, value_id: str) -> None:
 
         if event['type'] == 'drop':
             files = event['dataTransfer'].get('files', [])
+
+            # Map file names to their (name, path) entries, keeping the order of entries that share
+            # a name, so that each entry is unquoted only once
+            paths = {}
+            for item in _dnd_state['paths']:
+                paths.setdefault(urllib.parse.unquote(item[0]), []).append(item)
+
             for file in files:
-                path = [item for item in _dnd_state['paths'] if urllib.parse.unquote(item[0]) == file['name']]
-                if len(path) == 0:
+                items = paths.get(file['name'])
+                if not items:
                     continue
 
-                file['pywebviewFullPath'] = urllib.parse.unquote(path[0][1])
-                _dnd_state['paths'].remove(path[0])
+                item = items.pop(0)
+                file['pywebviewFullPath'] = urllib.parse.unquote(item[1])
+                _dnd_state['paths'].remove(item)
 
-        for handler in element._event_handlers.get(event['type'], []):
-            thread = Thread(target=handler, args=(event,))
-            thread.start()
+        try:
+            for handler in element._event_handlers.get(event['type'], []):
+                submit_bridge_call('event', handler, event)
+        except Exception:
+            logger.exception(
+                'Error occurred while dispatching event %s', event['type'])
 
         return
 
@@ -257,8 +439,7 @@ def js_bridge_call(window, func_name: str, param: Any, value_id: str) -> None:
     if func is not None:
         try:
             func_params = param
-            thread = Thread(target=_call)
-            thread.start()
+            submit_bridge_call('api', _call)
         except Exception:
             logger.exception(
                 'Error occurred while evaluating function %s', func_name)
@@ -266,40 +447,64 @@ def js_bridge_call(window, func_name: str, param: Any, value_id: str) -> None:
         logger.error('Function %s() does not exist', func_name)
 
 
-def load_js_files(window, func_list, platform: str) -> str:
-    js_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'js')
+@lru_cache(maxsize=1)
+def _load_js_templates() -> tuple:
+    """
+    Reads JS files from disk once and returns them as a tuple of (name, content, is_template)
+    triples in the order they should be loaded. Files without %(name)s placeholders are formatted
+    once here, so that they can be injected as is.
+    """
+    js_dir = os.path.join(_MODULE_DIR, 'js')
     js_files = glob(os.path.join(js_dir, '**', '*.js'), recursive=True)
-    ordered_js_files = sort_js_files(js_files)
-    js_code = ''
+    templates = []
 
-    for file in ordered_js_files:
-        with open(file, 'r') as f:
+    for file in sort_js_files(js_files):
+        with open(file, 'r', encoding='utf-8') as f:
             name = os.path.splitext(os.path.basename(file))[0]
             content = f.read()
-            params = {}
-
-            if name == 'api':
-                params = {
-                    'token': _TOKEN,
-                    'platform': platform,
-                    'uid': window.uid,
-                    'func_list': json.dumps(func_list),
-                    'js_api_endpoint': window.js_api_endpoint,
-                }
-            elif name == 'customize':
-                params = {
-                    'text_select': str(window.text_select),
-                    'drag_selector': webview.DRAG_REGION_SELECTOR,
-                    'zoomable': str(window.zoomable),
-                    'draggable': str(window.draggable),
-                    'easy_drag': str(platform == 'chromium' and window.easy_drag and window.frameless).lower(),
-                }
-            elif name == 'polyfill' and platform != 'mshtml':
-                continue
 
-            js_code += content % params
+        is_template = '%(' in content
+        if not is_template:
+            content = content % {}
 
-    return js_code
+        templates.append((name, content, is_template))
+
+    return tuple(templates)
+
+
+def load_js_files(window, func_list_json: str, platform: str) -> str:
+    js_code = []
+
+    for name, content, is_template in _load_js_templates():
+        params = {}
+
+        if name == 'polyfill' and platform != 'mshtml':
+            continue
+
+        if not is_template:
+            js_code.append(content)
+            continue
+
+        if name == 'api':
+            params = {
+                'token': _TOKEN,
+                'platform': platform,
+                'uid': window.uid,
+                'func_list': func_list_json,
+                'js_api_endpoint': window.js_api_endpoint,
+            }
+        elif name == 'customize':
+            params = {
+                'text_select': str(window.text_select),
+                'drag_selector': webview.DRAG_REGION_SELECTOR,
+                'zoomable': str(window.zoomable),
+                'draggable': str(window.draggable),
+                'easy_drag': str(platform == 'chromium' and window.easy_drag and window.frameless).lower(),
+            }
+
+        js_code.append(content % params)
+
+    return ''.join(js_code)
 
 
 def sort_js_files(js_files: list) -> list:
@@ -309,23 +514,18 @@ def sort_js_files(js_files: list) -> list:
     """
     LOAD_ORDER = { 'polyfill': 0, 'api': 1, 'finish': 99 }
 
-    ordered_js_files = []
-    remaining_js_files = []
-
-    for file in js_files:
+    def load_order(file: str) -> int:
         basename = os.path.splitext(os.path.basename(file))[0]
-        if basename not in LOAD_ORDER:
-            ordered_js_files.append(file)
-        else:
-            remaining_js_files.append((basename, file))
-
-    for basename, file in sorted(remaining_js_files, key=lambda x: LOAD_ORDER[x[0]]):
-        ordered_js_files.insert(LOAD_ORDER[basename], file)
+        return LOAD_ORDER.get(basename, 50)
 
-    return ordered_js_files
+    # sorted() is stable, so the rest of the files keep their relative order
+    return sorted(js_files, key=load_order)
 
 
 def escape_string(string: str) -> str:
+    # Chained str.replace calls are kept on purpose: each is a fast C-level scan that returns the
+    # original string when there is nothing to replace, while str.translate with multi-character
+    # replacements maps every character individually and is many times slower.
     return (
         string.replace('\\', '\\\\').replace('"', r"\"").replace('\n', r'\n').replace('\r', r'\r')
     )
@@ -343,32 +543,33 @@ def escape_line_breaks(string: str) -> str:
 
 
 def inject_base_uri(content: str, base_uri: str) -> str:
-    pattern = r'<%s(?:[\s]+[^>]*|)>'
     base_tag = f'<base href="{base_uri}">'
+    tags = {}
 
-    match = re.search(pattern % 'base', content)
+    for match in _BASE_TAG_RE.finditer(content):
+        tag_name = match.group('tag')
 
-    if match:
-        return content
+        if tag_name == 'base':
+            return content
 
-    match = re.search(pattern % 'head', content)
-    if match:
-        tag = match.group()
+        tags.setdefault(tag_name, match.group())
+
+    if 'head' in tags:
+        tag = tags['head']
         return content.replace(tag, tag + base_tag)
 
-    match = re.search(pattern % 'html', content)
-    if match:
-        tag = match.group()
+    if 'html' in tags:
+        tag = tags['html']
         return content.replace(tag, tag + base_tag)
 
-    match = re.search(pattern % 'body', content)
-    if match:
-        tag = match.group()
+    if 'body' in tags:
+        tag = tags['body']
         return content.replace(tag, base_tag + tag)
 
     return base_tag + content
 
 
+@lru_cache(maxsize=8)
 def interop_dll_path(dll_name: str) -> str:
     if dll_name == 'WebBrowserInterop.dll':
         dll_name = (
@@ -378,13 +579,11 @@ def interop_dll_path(dll_name: str) -> str:
         )
 
     # Unfrozen path
-    dll_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'lib', dll_name)
+    dll_path = os.path.join(_MODULE_DIR, 'lib', dll_name)
     if os.path.exists(dll_path):
         return dll_path
 
-    dll_path = os.path.join(
-        os.path.dirname(os.path.realpath(__file__)), 'lib', 'runtimes', dll_name, 'native'
-    )
+    dll_path = os.path.join(_MODULE_DIR, 'lib', 'runtimes', dll_name, 'native')
     if os.path.exists(dll_path):
         return dll_path
 
@@ -420,11 +619,15 @@ def environ_append(key: str, *values: str, sep=' ') -> None:
     os.environ[key] = sep.join(values)
 
 
+@lru_cache(maxsize=512)
 def css_to_camel(css_case_string: str) -> str:
+    if '-' not in css_case_string:
+        return css_case_string
+
     words = css_case_string.split('-')
     camel_case_string = words[0] + ''.join(word.capitalize() for word in words[1:])
     return camel_case_string
 
 
 def android_jar_path() -> str:
-    return os.path.join(os.path.dirname(os.path.realpath(__file__)), 'lib', 'pywebview-android.jar')
+    return os.path.join(_MODULE_DIR, 'lib', 'pywebview-android.jar')
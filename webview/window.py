@@ -1,6 +1,5 @@
 # from __future__ import annotations
 
-import inspect
 import logging
 import os
 from collections.abc import Mapping, Sequence
@@ -16,7 +15,8 @@ import webview.http as http
 from webview.errors import JavascriptException, WebViewException
 from webview.event import Event, EventContainer
 from webview.localization import original_localization
-from webview.util import (base_uri, escape_string, is_app, is_local_url, parse_file_type)
+from webview.util import (base_uri, escape_string, get_args, is_app, is_local_url,
+                          parse_file_type)
 from webview.dom.dom import DOM
 from webview.dom.element import Element
 from webview.screen import Screen
@@ -510,7 +510,7 @@ class Window:
         for func in functions:
             name = func.__name__
             self._functions[name] = func
-            params = list(inspect.getfullargspec(func).args)
+            params = get_args(func)
             func_list.append({'func': name, 'params': params})
 
         if self.events.loaded.is_set():